@@ -132,14 +132,15 @@ def argsort_labels_values(labels_values, reverse: bool = False):
         )
         return torch.argsort(idx, dim=-1, descending=reverse)
     elif isinstance(labels_values, np.ndarray):
-        # Index is appended at the end to get the indices corresponding to the
-        # sorted values. Because we append the indices at the end and since metadata
-        # is unique, we do not affect the sorted order.
-        list_tuples: List[List[int]] = labels_values.tolist()
-        for i in range(len(labels_values)):
-            list_tuples[i].append(i)
-        list_tuples.sort(reverse=reverse)
-        return np.array(list_tuples)[:, -1]
+        # np.lexsort uses the last key as the primary key, so we give it the columns in
+        # reverse order. This avoids converting each row to a Python list. The sort is
+        # stable, so reversing the output gives the same order as a descending sort of
+        # the (row, index) tuples.
+        sorted_idx = np.lexsort(labels_values.T[::-1])
+        if reverse:
+            # copy to get positive strides, which torch requires for indexing
+            sorted_idx = sorted_idx[::-1].copy()
+        return sorted_idx
     else:
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
@@ -214,6 +215,21 @@ def copy(array):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def cumsum(array, axis: int):
+    """
+    Returns the cumulative sum of the elements along the given axis. Arrays of bools
+    are summed as integers.
+
+    This function has the same behavior as ``np.cumsum(array, axis=axis)``.
+    """
+    if isinstance(array, TorchTensor):
+        return torch.cumsum(array, dim=axis)
+    elif isinstance(array, np.ndarray):
+        return np.cumsum(array, axis=axis)
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
 def detach(array):
     """Returns a new array, detached from the underlying computational graph, if any"""
     if isinstance(array, TorchTensor):
@@ -289,6 +305,144 @@ def eye_like(array, size: int):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+if torch_version >= (2, 1, 0):
+
+    def foreach_add(arrays_1: List[TorchTensor], arrays_2: List[TorchTensor]):
+        """
+        Add each array in ``arrays_1`` to the corresponding array in ``arrays_2``,
+        returning the list of sums.
+
+        For torch tensors, this uses ``torch._foreach_add`` to add all the tensors
+        with a single multi-tensor operation instead of dispatching one operation per
+        pair of tensors.
+        """
+        if len(arrays_1) == 0:
+            return arrays_1
+
+        if isinstance(arrays_1[0], TorchTensor):
+            _check_all_torch_tensor(arrays_1)
+            _check_all_torch_tensor(arrays_2)
+            return torch._foreach_add(arrays_1, arrays_2)
+        elif isinstance(arrays_1[0], np.ndarray):
+            _check_all_np_ndarray(arrays_1)
+            _check_all_np_ndarray(arrays_2)
+            return [array_1 + array_2 for array_1, array_2 in zip(arrays_1, arrays_2)]
+        else:
+            raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+    def foreach_add_(arrays_1: List[TorchTensor], arrays_2: List[TorchTensor]):
+        """
+        Add in-place each array in ``arrays_2`` to the corresponding array in
+        ``arrays_1``.
+
+        For torch tensors, this uses ``torch._foreach_add_`` to update all the tensors
+        with a single multi-tensor operation.
+        """
+        if len(arrays_1) == 0:
+            return
+
+        if isinstance(arrays_1[0], TorchTensor):
+            _check_all_torch_tensor(arrays_1)
+            _check_all_torch_tensor(arrays_2)
+            torch._foreach_add_(arrays_1, arrays_2)
+        elif isinstance(arrays_1[0], np.ndarray):
+            _check_all_np_ndarray(arrays_1)
+            _check_all_np_ndarray(arrays_2)
+            for array_1, array_2 in zip(arrays_1, arrays_2):
+                np.add(array_1, array_2, out=array_1)
+        else:
+            raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+    def foreach_add_constant_(arrays: List[TorchTensor], constant: float):
+        """
+        Add in-place the same ``constant`` to all the ``arrays``.
+
+        For torch tensors, this uses ``torch._foreach_add_`` to update all the tensors
+        with a single multi-tensor operation.
+        """
+        if len(arrays) == 0:
+            return
+
+        if isinstance(arrays[0], TorchTensor):
+            _check_all_torch_tensor(arrays)
+            torch._foreach_add_(arrays, constant)
+        elif isinstance(arrays[0], np.ndarray):
+            _check_all_np_ndarray(arrays)
+            for array in arrays:
+                np.add(array, constant, out=array)
+        else:
+            raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+else:
+
+    def foreach_add(arrays_1: List[TorchTensor], arrays_2: List[TorchTensor]):
+        """
+        Add each array in ``arrays_1`` to the corresponding array in ``arrays_2``,
+        returning the list of sums.
+
+        Older versions of torch do not support autograd with ``torch._foreach_add``,
+        so the tensors are added one pair at a time.
+        """
+        if len(arrays_1) == 0:
+            return arrays_1
+
+        if isinstance(arrays_1[0], TorchTensor):
+            _check_all_torch_tensor(arrays_1)
+            _check_all_torch_tensor(arrays_2)
+        elif isinstance(arrays_1[0], np.ndarray):
+            _check_all_np_ndarray(arrays_1)
+            _check_all_np_ndarray(arrays_2)
+        else:
+            raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+        return [array_1 + array_2 for array_1, array_2 in zip(arrays_1, arrays_2)]
+
+    def foreach_add_(arrays_1: List[TorchTensor], arrays_2: List[TorchTensor]):
+        """
+        Add in-place each array in ``arrays_2`` to the corresponding array in
+        ``arrays_1``.
+
+        Older versions of torch do not support autograd with ``torch._foreach_add_``,
+        so the tensors are updated one at a time.
+        """
+        if len(arrays_1) == 0:
+            return
+
+        if isinstance(arrays_1[0], TorchTensor):
+            _check_all_torch_tensor(arrays_1)
+            _check_all_torch_tensor(arrays_2)
+            for array_1, array_2 in zip(arrays_1, arrays_2):
+                array_1.add_(array_2)
+        elif isinstance(arrays_1[0], np.ndarray):
+            _check_all_np_ndarray(arrays_1)
+            _check_all_np_ndarray(arrays_2)
+            for array_1, array_2 in zip(arrays_1, arrays_2):
+                np.add(array_1, array_2, out=array_1)
+        else:
+            raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+    def foreach_add_constant_(arrays: List[TorchTensor], constant: float):
+        """
+        Add in-place the same ``constant`` to all the ``arrays``.
+
+        Older versions of torch do not support autograd with ``torch._foreach_add_``,
+        so the tensors are updated one at a time.
+        """
+        if len(arrays) == 0:
+            return
+
+        if isinstance(arrays[0], TorchTensor):
+            _check_all_torch_tensor(arrays)
+            for array in arrays:
+                array.add_(constant)
+        elif isinstance(arrays[0], np.ndarray):
+            _check_all_np_ndarray(arrays)
+            for array in arrays:
+                np.add(array, constant, out=array)
+        else:
+            raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
 def get_device(array):
     """
     Returns the device of the array if it is a
@@ -350,6 +504,64 @@ def int_array_like(int_list: List[int], like):
         raise TypeError(UNKNOWN_ARRAY_TYPE)
 
 
+def isin_rows(array, test_rows, like):
+    """
+    Returns a 1-dimensional array of bools indicating for each row of the 2-dimensional
+    ``array`` whether it is also present as a row of ``test_rows``. This is the
+    row-wise equivalent of ``np.isin(array, test_rows)``, and is used to compare
+    the values of different :py:class:`Labels` without looping over the entries.
+
+    The output is converted to a numpy array or torch tensor based on the type of
+    `like`, and placed on the same device as `like`.
+    """
+    if isinstance(array, TorchTensor):
+        _check_all_torch_tensor([test_rows])
+        # map each row to a single integer, and then compare these integers
+        n_rows = array.shape[0]
+        _, inverse = torch.unique(
+            torch.cat([array, test_rows.to(dtype=array.dtype, device=array.device)]),
+            dim=0,
+            return_inverse=True,
+        )
+        result = torch.isin(inverse[:n_rows], inverse[n_rows:])
+    elif isinstance(array, np.ndarray):
+        _check_all_np_ndarray([test_rows])
+        # view each row as a single opaque value, and compare these values
+        array = np.ascontiguousarray(array)
+        test_rows = np.ascontiguousarray(test_rows, dtype=array.dtype)
+        row_dtype = np.dtype((np.void, array.dtype.itemsize * array.shape[1]))
+        rows = array.view(row_dtype).reshape(-1)
+        test_rows = test_rows.view(row_dtype).reshape(-1)
+
+        if len(test_rows) == 0:
+            result = np.zeros(len(rows), dtype=bool)
+        elif 8 * len(test_rows) <= len(rows):
+            # when looking for a few rows in a large array, it is faster to only sort
+            # the rows we are looking for and binary search them, instead of sorting
+            # both arrays together as done by `np.isin`.
+            test_rows = np.sort(test_rows)
+            positions = np.searchsorted(test_rows, rows)
+            positions = np.minimum(positions, len(test_rows) - 1)
+            result = test_rows[positions] == rows
+        else:
+            result = np.isin(rows, test_rows)
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+    if isinstance(like, TorchTensor):
+        if isinstance(result, TorchTensor):
+            return result.to(device=like.device)
+        else:
+            return torch.tensor(result, dtype=torch.bool, device=like.device)
+    elif isinstance(like, np.ndarray):
+        if isinstance(result, TorchTensor):
+            return result.detach().cpu().numpy()
+        else:
+            return result
+    else:
+        raise TypeError(UNKNOWN_ARRAY_TYPE)
+
+
 def lstsq(X, Y, rcond: Optional[float], driver: Optional[str] = None):
     """
     Computes a solution to the least squares problem of a system of linear
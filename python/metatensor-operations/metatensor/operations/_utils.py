@@ -1,5 +1,6 @@
 from typing import List, Union
 
+from . import _dispatch
 from ._backend import TensorBlock, TensorMap
 
 
@@ -57,7 +58,9 @@ def _check_same_keys_impl(a: TensorMap, b: TensorMap, fname: str) -> str:
             f"got {len(keys_a)} and {len(keys_b)}"
         )
 
-    if not all([keys_b[i] in keys_a for i in range(len(keys_b))]):
+    # check all the keys at once instead of looking for them one by one
+    keys_b_in_a = _dispatch.isin_rows(keys_b.values, keys_a.values, like=keys_b.values)
+    if not bool(_dispatch.all(keys_b_in_a)):
         return f"inputs to '{fname}' should have the same keys"
 
     return ""
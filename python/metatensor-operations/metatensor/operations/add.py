@@ -1,6 +1,8 @@
 from typing import List, Union
 
+from . import _dispatch
 from ._backend import (
+    Array,
     TensorBlock,
     TensorMap,
     check_isinstance,
@@ -28,6 +30,9 @@ def _add_block_constant(block: TensorBlock, constant: float) -> TensorBlock:
         if len(gradient.gradients_list()) != 0:
             raise NotImplementedError("gradients of gradients are not supported")
 
+        # `gradient` is a view inside `block` and can not be given to `add_gradient`
+        # directly. Creating a new TensorBlock around the same values array shares
+        # the data without copying it.
         result_block.add_gradient(
             parameter=parameter,
             gradient=TensorBlock(
@@ -41,43 +46,112 @@ def _add_block_constant(block: TensorBlock, constant: float) -> TensorBlock:
     return result_block
 
 
-def _add_block_block(block_1: TensorBlock, block_2: TensorBlock) -> TensorBlock:
-    values = block_1.values + block_2.values
-
-    result_block = TensorBlock(
-        values=values,
-        samples=block_1.samples,
-        components=block_1.components,
-        properties=block_1.properties,
+def _add_blocks_blocks(
+    blocks_1: List[TensorBlock],
+    blocks_2: List[TensorBlock],
+    gradient_parameters: List[str],
+) -> List[TensorBlock]:
+    # the values (and gradients) of all blocks are added together at once, which
+    # allows torch to use a single multi-tensor kernel instead of one kernel per block
+    all_values = _dispatch.foreach_add(
+        [block.values for block in blocks_1],
+        [block.values for block in blocks_2],
     )
 
-    for parameter, gradient_1 in block_1.gradients():
-        gradient_2 = block_2.gradient(parameter)
+    result_blocks: List[TensorBlock] = []
+    for block_1, values in zip(blocks_1, all_values):
+        result_blocks.append(
+            TensorBlock(
+                values=values,
+                samples=block_1.samples,
+                components=block_1.components,
+                properties=block_1.properties,
+            )
+        )
 
-        assert gradient_1.values.shape == gradient_2.values.shape
-        assert gradient_1.samples == gradient_2.samples
+    # the metadata of the gradients was already compared by `add()`, so it is used
+    # as-is for the new gradients
+    for parameter in gradient_parameters:
+        gradients_1: List[TensorBlock] = []
+        gradients_2: List[TensorBlock] = []
+        for block_1, block_2 in zip(blocks_1, blocks_2):
+            gradient_1 = block_1.gradient(parameter)
+            gradient_2 = block_2.gradient(parameter)
 
-        if len(gradient_1.gradients_list()) != 0:
-            raise NotImplementedError("gradients of gradients are not supported")
+            if len(gradient_1.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
 
-        if len(gradient_2.gradients_list()) != 0:
-            raise NotImplementedError("gradients of gradients are not supported")
+            if len(gradient_2.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
 
-        result_block.add_gradient(
-            parameter=parameter,
-            gradient=TensorBlock(
-                values=gradient_1.values + gradient_2.values,
-                samples=gradient_1.samples,
-                components=gradient_1.components,
-                properties=gradient_1.properties,
-            ),
+            gradients_1.append(gradient_1)
+            gradients_2.append(gradient_2)
+
+        all_gradient_values = _dispatch.foreach_add(
+            [gradient.values for gradient in gradients_1],
+            [gradient.values for gradient in gradients_2],
         )
 
-    return result_block
+        for result_block, gradient_1, gradient_values in zip(
+            result_blocks, gradients_1, all_gradient_values
+        ):
+            result_block.add_gradient(
+                parameter=parameter,
+                gradient=TensorBlock(
+                    values=gradient_values,
+                    samples=gradient_1.samples,
+                    components=gradient_1.components,
+                    properties=gradient_1.properties,
+                ),
+            )
+
+    return result_blocks
+
+
+def _add_blocks_constant_inplace(blocks: List[TensorBlock], constant: float):
+    for block in blocks:
+        for _, gradient in block.gradients():
+            if len(gradient.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+    # the gradients are not modified by the addition of a constant
+    _dispatch.foreach_add_constant_([block.values for block in blocks], constant)
+
+
+def _add_blocks_blocks_inplace(
+    blocks_1: List[TensorBlock],
+    blocks_2: List[TensorBlock],
+    gradient_parameters: List[str],
+):
+    # same as `_add_blocks_blocks`, updating all the arrays of `blocks_1` at once
+    _dispatch.foreach_add_(
+        [block.values for block in blocks_1],
+        [block.values for block in blocks_2],
+    )
+
+    for parameter in gradient_parameters:
+        gradients_values_1: List[Array] = []
+        gradients_values_2: List[Array] = []
+        for block_1, block_2 in zip(blocks_1, blocks_2):
+            gradient_1 = block_1.gradient(parameter)
+            gradient_2 = block_2.gradient(parameter)
+
+            if len(gradient_1.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+            if len(gradient_2.gradients_list()) != 0:
+                raise NotImplementedError("gradients of gradients are not supported")
+
+            gradients_values_1.append(gradient_1.values)
+            gradients_values_2.append(gradient_2.values)
+
+        _dispatch.foreach_add_(gradients_values_1, gradients_values_2)
 
 
 @torch_jit_script
-def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
+def add(
+    A: TensorMap, B: Union[int, float, TensorMap], inplace: bool = False
+) -> TensorMap:
     r"""Return a new :class:`TensorMap` with the values being the sum of
     ``A`` and ``B``.
 
@@ -99,8 +173,14 @@ def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
     :param B: Second instance for the addition. Parameter can be a scalar or a
               :py:class:`TensorMap`. In the latter case ``B`` must have the same
               metadata of ``A``.
-
-    :return: New :py:class:`TensorMap` with the same metadata as ``A``.
+    :param inplace: if :py:obj:`True`, the sum is written directly in the values and
+              gradients of ``A`` instead of allocating new arrays, and ``A`` itself
+              is returned. The data of ``A`` is modified, and must be able to hold the
+              result of the addition (e.g. integer arrays can not be modified in-place
+              by adding a floating point constant).
+
+    :return: New :py:class:`TensorMap` with the same metadata as ``A``, or ``A`` if
+             ``inplace`` is :py:obj:`True`.
     """
 
     if not torch_jit_is_scripting():
@@ -115,24 +195,67 @@ def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
 
     if isinstance(B, (float, int)):
         B = float(B)
-        for block_A in A.blocks():
-            blocks.append(_add_block_constant(block=block_A, constant=B))
+        if inplace:
+            _add_blocks_constant_inplace(blocks=A.blocks(), constant=B)
+        else:
+            for block_A in A.blocks():
+                blocks.append(_add_block_constant(block=block_A, constant=B))
 
     elif is_tensor_map:
-        _check_same_keys_raise(A, B, "add")
+        # adding a TensorMap to itself does not require any metadata check
+        if torch_jit_is_scripting():
+            same_tensor = False
+        else:
+            same_tensor = A is B
+
+        if not same_tensor:
+            _check_same_keys_raise(A, B, "add")
+
+        # all blocks in a TensorMap have the same gradient parameters, so we only
+        # need to look them up once instead of once per block
+        gradient_parameters: List[str] = []
+        check_gradients = False
+        if len(A) != 0:
+            gradient_parameters = A.block(0).gradients_list()
+            check_gradients = len(gradient_parameters) != 0
+            if not same_tensor and len(B.block(0).gradients_list()) != 0:
+                check_gradients = True
+
+        blocks_A: List[TensorBlock] = []
+        blocks_B: List[TensorBlock] = []
         for key, block_A in A.items():
+            if same_tensor:
+                blocks_A.append(block_A)
+                blocks_B.append(block_A)
+                continue
+
             block_B = B[key]
             _check_blocks_raise(
                 block_A,
                 block_B,
                 fname="add",
             )
-            _check_same_gradients_raise(
-                block_A,
-                block_B,
-                fname="add",
+            if check_gradients:
+                _check_same_gradients_raise(
+                    block_A,
+                    block_B,
+                    fname="add",
+                )
+            blocks_A.append(block_A)
+            blocks_B.append(block_B)
+
+        if inplace:
+            _add_blocks_blocks_inplace(
+                blocks_1=blocks_A,
+                blocks_2=blocks_B,
+                gradient_parameters=gradient_parameters,
+            )
+        else:
+            blocks = _add_blocks_blocks(
+                blocks_1=blocks_A,
+                blocks_2=blocks_B,
+                gradient_parameters=gradient_parameters,
             )
-            blocks.append(_add_block_block(block_1=block_A, block_2=block_B))
     else:
         if torch_jit_is_scripting():
             extra = ""
@@ -141,4 +264,7 @@ def add(A: TensorMap, B: Union[int, float, TensorMap]) -> TensorMap:
 
         raise TypeError("`B` must be a metatensor TensorMap or a scalar value" + extra)
 
+    if inplace:
+        return A
+
     return TensorMap(A.keys, blocks)
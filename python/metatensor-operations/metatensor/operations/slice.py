@@ -1,5 +1,9 @@
+import concurrent.futures
+from typing import Dict, List
+
 from . import _dispatch
 from ._backend import (
+    Array,
     Labels,
     TensorBlock,
     TensorMap,
@@ -10,143 +14,178 @@ from ._backend import (
 from ._dispatch import TorchTensor
 
 
-def _slice_block(block: TensorBlock, axis: str, labels: Labels) -> TensorBlock:
+def _sliced_metadata(block: TensorBlock, axis: str, labels: Labels) -> Labels:
+    """
+    Get the metadata of ``block`` along ``axis``, only keeping the same names as
+    ``labels``.
+    """
     if axis == "samples":
-        # only keep the same names as `labels`
-        all_samples = block.samples.view(labels.names)
-        # create an arrays of bools indicating which samples indices to keep
-        samples_mask = _dispatch.bool_array_like(
-            [all_samples.entry(i) in labels for i in range(len(all_samples))],
-            block.values,
-        )
-        new_values = _dispatch.mask(block.values, 0, samples_mask)
-        new_samples = Labels(
-            block.samples.names,
-            _dispatch.mask(block.samples.values, 0, samples_mask),
-        )
+        return block.samples.view(labels.names)
+    else:
+        assert axis == "properties"
+        return block.properties.view(labels.names)
 
-        new_block = TensorBlock(
-            values=new_values,
-            samples=new_samples,
-            components=block.components,
-            properties=block.properties,
-        )
 
-        # Create a map from the previous samples indexes to the new sample indexes
-        # to update the gradient samples
+def _slice_masks(blocks: List[TensorBlock], axis: str, labels: Labels) -> List[Array]:
+    """
+    Create the arrays of bools indicating which indices along ``axis`` to keep in each
+    of the ``blocks``.
+    """
+    # Different blocks frequently share the same samples or properties, in which case
+    # we can re-use the same mask. We only compare with the last metadata of a given
+    # size, to keep the cost of the cache linear in the number of blocks.
+    #
+    # The metadata is a view created with `Labels.view()`, and the names are always
+    # the same as `labels.names`, so we only compare the values (comparing Labels
+    # views directly is not supported by metatensor-torch).
+    cached_values: Dict[int, Array] = {}
+    cached_masks: Dict[int, Array] = {}
+
+    masks: List[Array] = []
+    for block in blocks:
+        values = _sliced_metadata(block, axis, labels).values
+        size = values.shape[0]
+
+        same_values = False
+        if size in cached_values:
+            same_values = bool(_dispatch.all(cached_values[size] == values))
+
+        if same_values:
+            mask = cached_masks[size]
+        else:
+            mask = _dispatch.isin_rows(values, labels.values, like=block.values)
+            cached_values[size] = values
+            cached_masks[size] = mask
+
+        masks.append(mask)
+
+    return masks
+
+
+def _slice_block_samples(block: TensorBlock, samples_mask: Array) -> TensorBlock:
+    new_values = _dispatch.mask(block.values, 0, samples_mask)
+
+    samples = block.samples
+    new_samples = Labels(samples.names, _dispatch.mask(samples.values, 0, samples_mask))
+
+    new_block = TensorBlock(
+        values=new_values,
+        samples=new_samples,
+        components=block.components,
+        properties=block.properties,
+    )
 
-        # sample_map contains at position old_sample the index of the
-        # corresponding new sample
-        sample_map = _dispatch.int_array_like(
-            int_list=[-1] * len(samples_mask),
-            like=samples_mask,
-        )
-        last = 0
-        for i, picked in enumerate(samples_mask):
-            if picked:
-                sample_map[i] = last
-                last += 1
-
-        for parameter, gradient in block.gradients():
-            if len(gradient.gradients_list()) != 0:
-                raise NotImplementedError("gradients of gradients are not supported")
-
-            sample_column = gradient.samples.column("sample")
-            if not isinstance(gradient.samples.values, TorchTensor) and isinstance(
-                samples_mask, TorchTensor
-            ):
-                # Torch complains if `sample_column` is numpy since it tries to convert
-                # it to a Tensor, but the numpy array is read-only. Making a copy
-                # removes the read-only marker
-                sample_column = sample_column.copy()
-
-            # Create a samples filter for the Gradient TensorBlock
-            grad_samples_mask = samples_mask[_dispatch.to_index_array(sample_column)]
-
-            new_grad_samples_values = _dispatch.mask(
-                gradient.samples.values, 0, grad_samples_mask
-            )
+    # Create a map from the previous samples indexes to the new sample indexes
+    # to update the gradient samples
 
-            if new_grad_samples_values.shape[0] != 0:
-                # update the "sample" column of the gradient samples
-                # to refer to the new samples
-                new_grad_samples_values[:, 0] = sample_map[
-                    _dispatch.to_index_array(new_grad_samples_values[:, 0])
-                ]
+    # sample_map contains at position old_sample the index of the
+    # corresponding new sample, or -1 if the sample was not picked
+    sample_map = _dispatch.cumsum(samples_mask, axis=0) * samples_mask - 1
 
-                new_grad_samples = Labels(
-                    names=gradient.samples.names,
-                    values=new_grad_samples_values,
-                )
-            else:
-                new_grad_samples = Labels(
-                    names=gradient.samples.names,
-                    values=_dispatch.empty_like(
-                        gradient.samples.values, [0, gradient.samples.values.shape[1]]
-                    ),
-                )
+    for parameter, gradient in block.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
 
-            new_grad_values = _dispatch.mask(gradient.values, 0, grad_samples_mask)
-            # Add sliced gradient to the TensorBlock
-            new_block.add_gradient(
-                parameter=parameter,
-                gradient=TensorBlock(
-                    values=new_grad_values,
-                    samples=new_grad_samples,
-                    components=gradient.components,
-                    properties=new_block.properties,
-                ),
-            )
+        # accessing the metadata of a block creates a new Labels each time, so we
+        # only do it once per gradient
+        grad_samples = gradient.samples
 
-    else:
-        assert axis == "properties"
-        # only keep the same names as `labels`
-        all_properties = block.properties.view(list(labels.names))
-        # create an arrays of bools indicating which samples indices to keep
-        properties_mask = _dispatch.bool_array_like(
-            [all_properties.entry(i) in labels for i in range(len(all_properties))],
-            block.values,
-        )
-        new_values = _dispatch.mask(
-            block.values, len(block.values.shape) - 1, properties_mask
+        sample_column = grad_samples.column("sample")
+        if not isinstance(grad_samples.values, TorchTensor) and isinstance(
+            samples_mask, TorchTensor
+        ):
+            # Torch complains if `sample_column` is numpy since it tries to convert
+            # it to a Tensor, but the numpy array is read-only. Making a copy
+            # removes the read-only marker
+            sample_column = sample_column.copy()
+
+        # Create a samples filter for the Gradient TensorBlock
+        grad_samples_mask = samples_mask[_dispatch.to_index_array(sample_column)]
+
+        new_grad_samples_values = _dispatch.mask(
+            grad_samples.values, 0, grad_samples_mask
         )
-        new_properties = Labels(
-            block.properties.names,
-            _dispatch.mask(block.properties.values, 0, properties_mask),
+
+        # update the "sample" column of the gradient samples to refer to the new
+        # samples. `new_grad_samples_values` is a fresh array created by
+        # `_dispatch.mask`, so it can be modified in-place and used directly for
+        # the new Labels, even if it is empty.
+        new_grad_samples_values[:, 0] = sample_map[
+            _dispatch.to_index_array(new_grad_samples_values[:, 0])
+        ]
+
+        new_grad_samples = Labels(
+            names=grad_samples.names,
+            values=new_grad_samples_values,
         )
 
-        new_block = TensorBlock(
-            values=new_values,
-            samples=block.samples,
-            components=block.components,
-            properties=new_properties,
+        new_grad_values = _dispatch.mask(gradient.values, 0, grad_samples_mask)
+        # Add sliced gradient to the TensorBlock
+        new_block.add_gradient(
+            parameter=parameter,
+            gradient=TensorBlock(
+                values=new_grad_values,
+                samples=new_grad_samples,
+                components=gradient.components,
+                properties=new_block.properties,
+            ),
         )
 
-        # Slice each Gradient TensorBlock and add to the new_block.
-        for parameter, gradient in block.gradients():
-            if len(gradient.gradients_list()) != 0:
-                raise NotImplementedError("gradients of gradients are not supported")
+    return new_block
 
-            assert axis == "properties"
-            new_grad_values = _dispatch.mask(
-                gradient.values, len(gradient.values.shape) - 1, properties_mask
-            )
-            new_grad_samples = gradient.samples
-
-            # Add sliced gradient to the TensorBlock
-            new_block.add_gradient(
-                parameter=parameter,
-                gradient=TensorBlock(
-                    values=new_grad_values,
-                    samples=new_grad_samples,
-                    components=gradient.components,
-                    properties=new_block.properties,
-                ),
-            )
+
+def _slice_block_properties(block: TensorBlock, properties_mask: Array) -> TensorBlock:
+    # the same indices are used to slice the values and all the gradients, so we only
+    # compute them once
+    properties_indices = _dispatch.where(properties_mask)[0]
+
+    new_values = _dispatch.take(
+        block.values, properties_indices, axis=len(block.values.shape) - 1
+    )
+    new_properties = Labels(
+        block.properties.names,
+        _dispatch.mask(block.properties.values, 0, properties_mask),
+    )
+
+    new_block = TensorBlock(
+        values=new_values,
+        samples=block.samples,
+        components=block.components,
+        properties=new_properties,
+    )
+
+    # Slice each Gradient TensorBlock and add to the new_block.
+    for parameter, gradient in block.gradients():
+        if len(gradient.gradients_list()) != 0:
+            raise NotImplementedError("gradients of gradients are not supported")
+
+        new_grad_values = _dispatch.take(
+            gradient.values, properties_indices, axis=len(gradient.values.shape) - 1
+        )
+        new_grad_samples = gradient.samples
+
+        # Add sliced gradient to the TensorBlock
+        new_block.add_gradient(
+            parameter=parameter,
+            gradient=TensorBlock(
+                values=new_grad_values,
+                samples=new_grad_samples,
+                components=gradient.components,
+                properties=new_block.properties,
+            ),
+        )
 
     return new_block
 
 
+def _slice_block(block: TensorBlock, axis: str, mask: Array) -> TensorBlock:
+    if axis == "samples":
+        return _slice_block_samples(block, mask)
+    else:
+        assert axis == "properties"
+        return _slice_block_properties(block, mask)
+
+
 def _check_args(
     block: TensorBlock,
     axis: str,
@@ -167,24 +206,25 @@ def _check_args(
             raise TypeError(f"`labels` must be metatensor Labels, not {type(labels)}")
 
     if axis == "samples":
-        s_names = block.samples.names
-        for name in labels.names:
-            if name not in s_names:
-                raise ValueError(
-                    f"invalid sample name '{name}' which is not part of the input"
-                )
+        kind = "sample"
+        names = block.samples.names
     else:
         assert axis == "properties"
-        p_names = block.properties.names
-        for name in labels.names:
-            if name not in p_names:
-                raise ValueError(
-                    f"invalid property name '{name}' which is not part of the input"
-                )
+        kind = "property"
+        names = block.properties.names
+
+    # TorchScript does not support sets, but there are only a handful of names
+    for name in labels.names:
+        if name not in names:
+            raise ValueError(
+                f"invalid {kind} name '{name}' which is not part of the input"
+            )
 
 
 @torch_jit_script
-def slice(tensor: TensorMap, axis: str, labels: Labels) -> TensorMap:
+def slice(
+    tensor: TensorMap, axis: str, labels: Labels, num_threads: int = 1
+) -> TensorMap:
     """
     Slice a :py:class:`TensorMap` along either the ``"samples"`` or ``"properties"`
     ``axis``. ``labels`` is a :py:class:`Labels` objects that specifies the
@@ -197,7 +237,7 @@ def slice(tensor: TensorMap, axis: str, labels: Labels) -> TensorMap:
     corresponding keys as the input. If any block upon slicing is reduced to nothing,
     i.e. in the case that it has none of the specified ``labels`` along the
     ``"samples"`` or ``"properties"`` ``axis``, an empty block (i.e. a block with one of
-    the dimension set to 0) will used for this key, and a warning will be emitted.
+    the dimension set to 0) will be used for this key.
 
     See the documentation for the :py:func:`slice_block` function to see how an
     individual :py:class:`TensorBlock` is sliced.
@@ -208,6 +248,8 @@ def slice(tensor: TensorMap, axis: str, labels: Labels) -> TensorMap:
     :param labels: a :py:class:`Labels` object containing the names and indices of the
         "samples" or "properties" to keep in each of the sliced :py:class:`TensorBlock`
         of the output :py:class:`TensorMap`.
+    :param num_threads: number of threads used to slice different blocks in parallel.
+        This is only used in Python mode, and ignored when using TorchScript.
 
     :return: a :py:class:`TensorMap` that corresponds to the sliced input tensor.
     """
@@ -218,15 +260,35 @@ def slice(tensor: TensorMap, axis: str, labels: Labels) -> TensorMap:
                 f"`tensor` must be a metatensor TensorMap, not {type(tensor)}"
             )
 
+    if num_threads < 1:
+        raise ValueError(f"`num_threads` must be at least 1, got {num_threads}")
+
     _check_args(tensor.block(0), axis=axis, labels=labels)
 
-    return TensorMap(
-        keys=tensor.keys,
-        blocks=[
-            _slice_block(tensor[tensor.keys.entry(i)], axis, labels)
-            for i in range(len(tensor.keys))
-        ],
-    )
+    all_blocks = tensor.blocks()
+    masks = _slice_masks(all_blocks, axis, labels)
+
+    if torch_jit_is_scripting():
+        blocks = [
+            _slice_block(block, axis, mask) for block, mask in zip(all_blocks, masks)
+        ]
+    else:
+        if num_threads == 1:
+            blocks = [
+                _slice_block(block, axis, mask)
+                for block, mask in zip(all_blocks, masks)
+            ]
+        else:
+            # the blocks are independent, and most of the work happens in numpy/torch
+            # functions which release the GIL
+            with concurrent.futures.ThreadPoolExecutor(num_threads) as executor:
+                blocks = list(
+                    executor.map(
+                        _slice_block, all_blocks, [axis] * len(all_blocks), masks
+                    )
+                )
+
+    return TensorMap(keys=tensor.keys, blocks=blocks)
 
 
 @torch_jit_script
@@ -258,8 +320,5 @@ def slice_block(block: TensorBlock, axis: str, labels: Labels) -> TensorBlock:
 
     _check_args(block, axis=axis, labels=labels)
 
-    return _slice_block(
-        block,
-        axis=axis,
-        labels=labels,
-    )
+    mask = _slice_masks([block], axis, labels)[0]
+    return _slice_block(block, axis=axis, mask=mask)
@@ -8,7 +8,7 @@ from ._backend import (
     torch_jit_is_scripting,
     torch_jit_script,
 )
-from .slice import _slice_block
+from .slice import _slice_block, _slice_masks
 
 
 def _split_block(
@@ -25,7 +25,8 @@ def _split_block(
     new_blocks: List[TensorBlock] = []
     for indices in grouped_labels:
         # perform the slice either along the samples or properties axis
-        new_block = _slice_block(block, axis=axis, labels=indices)
+        mask = _slice_masks([block], axis, indices)[0]
+        new_block = _slice_block(block, axis=axis, mask=mask)
         new_blocks.append(new_block)
 
     return new_blocks
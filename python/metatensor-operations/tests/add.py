@@ -5,6 +5,19 @@ import metatensor
 from metatensor import Labels, TensorBlock, TensorMap
 
 
+try:
+    import torch  # noqa
+
+    HAS_TORCH = True
+    if torch.cuda.is_available():
+        HAS_CUDA = True
+    else:
+        HAS_CUDA = False
+except ImportError:
+    HAS_TORCH = False
+    HAS_CUDA = False
+
+
 @pytest.fixture
 def keys():
     keys = Labels(names=["key_1", "key_2"], values=np.array([[0, 0], [1, 0]]))
@@ -238,6 +251,44 @@ def test_self_add_scalar_gradient(tensor_A, tensor_res_2):
     metatensor.equal_raise(tensor_A, tensor_A_copy)
 
 
+def test_self_add_tensors_inplace(tensor_A, tensor_B, tensor_res_1):
+    tensor_B_copy = tensor_B.copy()
+
+    result = metatensor.add(tensor_A, tensor_B, inplace=True)
+    assert result is tensor_A
+    metatensor.allclose_raise(tensor_A, tensor_res_1)
+
+    # Check that only A was modified
+    metatensor.equal_raise(tensor_B, tensor_B_copy)
+
+
+def test_self_add_scalar_inplace(tensor_A, tensor_res_2):
+    result = metatensor.add(tensor_A, 5.1, inplace=True)
+    assert result is tensor_A
+    metatensor.allclose_raise(tensor_A, tensor_res_2)
+
+
+def test_self_add_same_tensor(tensor_A):
+    metatensor.allclose_raise(
+        metatensor.add(tensor_A, tensor_A), metatensor.multiply(tensor_A, 2)
+    )
+
+
+@pytest.mark.skipif(not HAS_CUDA, reason="requires cuda")
+@pytest.mark.skipif(not HAS_TORCH, reason="requires torch")
+def test_add_different_device():
+    block = metatensor.block_from_array(torch.rand((6, 5, 7), device="cuda"))
+    tensor = TensorMap(Labels.range("_", 1), [block])
+
+    # the sums should be computed on the device, without going through the CPU
+    for B in [tensor, 3.0]:
+        result = metatensor.add(tensor, B)
+        assert result.block().values.device == block.values.device
+
+    result = metatensor.add(tensor, tensor, inplace=True)
+    assert result.block().values.device == block.values.device
+
+
 def test_self_add_error():
     block = TensorBlock(
         values=np.array([[1, 2], [3, 5]]),
@@ -8,8 +8,13 @@ try:
     import torch
 
     HAS_TORCH = True
+    if torch.cuda.is_available():
+        HAS_CUDA = True
+    else:
+        HAS_CUDA = False
 except ImportError:
     HAS_TORCH = False
+    HAS_CUDA = False
 
 if HAS_TORCH:
     create_array_functions = [np.array, torch.tensor]
@@ -27,3 +32,73 @@ def test_all(create_array_function):
     assert not metatensor.operations._dispatch.all(
         create_array_function(all_false_array)
     )
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_isin_rows(create_array_function):
+    array = create_array_function([[0, 1], [1, 2], [0, 3], [5, 5]])
+    test_rows = create_array_function([[0, 3], [1, 2], [7, 7]])
+
+    result = metatensor.operations._dispatch.isin_rows(array, test_rows, like=array)
+    assert result.tolist() == [False, True, True, False]
+
+    empty = create_array_function([[0, 1]])[:0]
+    result = metatensor.operations._dispatch.isin_rows(array, empty, like=array)
+    assert result.tolist() == [False, False, False, False]
+
+    result = metatensor.operations._dispatch.isin_rows(empty, test_rows, like=array)
+    assert result.tolist() == []
+
+
+@pytest.mark.skipif(not HAS_CUDA, reason="requires cuda")
+def test_isin_rows_different_device():
+    array = torch.tensor([[0, 1], [1, 2], [0, 3]], device="cuda")
+    test_rows = torch.tensor([[0, 3], [7, 7]], device="cpu")
+
+    result = metatensor.operations._dispatch.isin_rows(array, test_rows, like=array)
+    assert result.device.type == "cuda"
+    assert result.tolist() == [False, False, True]
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_foreach_add(create_array_function):
+    arrays_1 = [create_array_function([1.0, 2.0]), create_array_function([[3.0]])]
+    arrays_2 = [create_array_function([4.0, 5.0]), create_array_function([[6.0]])]
+
+    result = metatensor.operations._dispatch.foreach_add(arrays_1, arrays_2)
+    assert len(result) == 2
+    assert result[0].tolist() == [5.0, 7.0]
+    assert result[1].tolist() == [[9.0]]
+
+    assert metatensor.operations._dispatch.foreach_add([], []) == []
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_foreach_add_(create_array_function):
+    arrays_1 = [create_array_function([1.0, 2.0]), create_array_function([[3.0]])]
+    arrays_2 = [create_array_function([4.0, 5.0]), create_array_function([[6.0]])]
+
+    metatensor.operations._dispatch.foreach_add_(arrays_1, arrays_2)
+    assert arrays_1[0].tolist() == [5.0, 7.0]
+    assert arrays_1[1].tolist() == [[9.0]]
+    assert arrays_2[0].tolist() == [4.0, 5.0]
+
+
+def test_isin_rows_large():
+    # exercise both the `np.isin` and binary search code paths
+    array = np.arange(200, dtype=np.int32).reshape(100, 2)
+    for n_test_rows in [3, 50]:
+        test_rows = array[::-7][:n_test_rows]
+        expected = [row.tolist() in test_rows.tolist() for row in array]
+
+        result = metatensor.operations._dispatch.isin_rows(array, test_rows, array)
+        assert result.tolist() == expected
+
+
+@pytest.mark.parametrize("create_array_function", create_array_functions)
+def test_foreach_add_constant_(create_array_function):
+    arrays = [create_array_function([1.0, 2.0]), create_array_function([[3.0]])]
+
+    metatensor.operations._dispatch.foreach_add_constant_(arrays, 0.5)
+    assert arrays[0].tolist() == [1.5, 2.5]
+    assert arrays[1].tolist() == [[3.5]]
@@ -260,6 +260,24 @@ def test_slice_samples(tensor):
         _check_empty_block(tensor.block(key), sliced_block, "s")
 
 
+def test_slice_num_threads(tensor):
+    systems_to_keep = np.arange(2, 10, 2).reshape(-1, 1)
+    samples = Labels(
+        names=["system"],
+        values=systems_to_keep,
+    )
+
+    sliced_tensor = metatensor.slice(tensor, axis="samples", labels=samples)
+    sliced_tensor_threads = metatensor.slice(
+        tensor, axis="samples", labels=samples, num_threads=4
+    )
+    metatensor.equal_raise(sliced_tensor, sliced_tensor_threads)
+
+    message = "`num_threads` must be at least 1, got 0"
+    with pytest.raises(ValueError, match=message):
+        metatensor.slice(tensor, axis="samples", labels=samples, num_threads=0)
+
+
 # ===== Tests for slicing along properties =====
 
 
@@ -4,7 +4,7 @@ import torch
 from packaging import version
 
 import metatensor.torch
-from metatensor.torch import Labels, TensorMap
+from metatensor.torch import Labels, TensorBlock, TensorMap
 
 
 def test_slice():
@@ -38,6 +38,37 @@ def test_slice():
     )
 
 
+def test_slice_multiple_blocks():
+    # the first two blocks share the same samples and properties, the last one has the
+    # same number of samples and properties but different values
+    blocks = [
+        metatensor.torch.block_from_array(torch.tensor([[0, 1, 2], [3, 4, 5]])),
+        metatensor.torch.block_from_array(torch.tensor([[6, 7, 8], [9, 10, 11]])),
+        TensorBlock(
+            values=torch.tensor([[12, 13, 14], [15, 16, 17]]),
+            samples=Labels(names=["sample"], values=torch.tensor([[1], [2]])),
+            components=[],
+            properties=Labels(names=["property"], values=torch.tensor([[1], [2], [3]])),
+        ),
+    ]
+    tensor = TensorMap(
+        keys=Labels(names=["key"], values=torch.tensor([[0], [1], [2]])),
+        blocks=blocks,
+    )
+
+    samples = Labels(names=["sample"], values=torch.tensor([[1]]))
+    sliced_tensor = metatensor.torch.slice(tensor, axis="samples", labels=samples)
+    assert torch.equal(sliced_tensor.block(0).values, torch.tensor([[3, 4, 5]]))
+    assert torch.equal(sliced_tensor.block(1).values, torch.tensor([[9, 10, 11]]))
+    assert torch.equal(sliced_tensor.block(2).values, torch.tensor([[12, 13, 14]]))
+
+    properties = Labels(names=["property"], values=torch.tensor([[1]]))
+    sliced_tensor = metatensor.torch.slice(tensor, axis="properties", labels=properties)
+    assert torch.equal(sliced_tensor.block(0).values, torch.tensor([[1], [4]]))
+    assert torch.equal(sliced_tensor.block(1).values, torch.tensor([[7], [10]]))
+    assert torch.equal(sliced_tensor.block(2).values, torch.tensor([[12], [15]]))
+
+
 def test_slice_block():
     block = metatensor.torch.block_from_array(torch.tensor([[0, 1, 2], [3, 4, 5]]))
     samples = Labels(names=["sample"], values=torch.tensor([[1]]))